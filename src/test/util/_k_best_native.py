@@ -0,0 +1,129 @@
+"""
+This module provides Numba-compiled kernels for the batched k-best selection.
+
+The k smallest measurements are kept in a fixed-size max-heap stored in a
+contiguous `float64` buffer, so that heap maintenance runs on native doubles
+instead of boxed Python floats. `consume` feeds a whole batch of measurements
+through the heap, tracking the overall minimum and checking the convergence
+criterion after every measurement, in a single call.
+"""
+
+__all__: list[str] = ["consume"]
+
+import numba
+import numpy as np
+
+
+@numba.njit(cache=True)
+def _heap_push_max(
+    heap: np.ndarray,
+    size: int,
+    value: float,
+) -> float:
+    """
+    Pushes a value onto a max-heap that is not yet full.
+
+    Args:
+        heap: The buffer holding the max-heap in its first `size` slots.
+        size: The number of elements currently in the heap. Must be less than `len(heap)`.
+        value: The value to push.
+
+    Returns:
+        The new top (largest element) of the heap.
+    """
+
+    i = size
+    while i > 0:
+        parent = (i - 1) >> 1
+        if heap[parent] >= value:
+            break
+        heap[i] = heap[parent]
+        i = parent
+    heap[i] = value
+
+    return heap[0]
+
+
+@numba.njit(cache=True)
+def _heap_pushpop_max(
+    heap: np.ndarray,
+    size: int,
+    value: float,
+) -> float:
+    """
+    Pushes a value onto a full max-heap and pops its largest element.
+
+    Args:
+        heap: The buffer holding the max-heap in its first `size` slots.
+        size: The number of elements in the heap. Must be greater than 0.
+        value: The value to push.
+
+    Returns:
+        The new top (largest element) of the heap.
+    """
+
+    # The value itself would be popped right away, leaving the heap unchanged.
+    if value >= heap[0]:
+        return heap[0]
+
+    # Replace the top with the value and sift it down.
+    i = 0
+    while True:
+        child = 2 * i + 1
+        if child >= size:
+            break
+        if child + 1 < size and heap[child + 1] > heap[child]:
+            child += 1
+        if heap[child] <= value:
+            break
+        heap[i] = heap[child]
+        i = child
+    heap[i] = value
+
+    return heap[0]
+
+
+@numba.njit(cache=True)
+def consume(
+    heap: np.ndarray,
+    size: int,
+    minimum: float,
+    epsilon: float,
+    measurements: np.ndarray,
+) -> tuple[bool, int, float]:
+    """
+    Feeds a batch of measurements through the k-best selection, stopping at convergence.
+
+    Args:
+        heap: A buffer of length k holding the k smallest measurements seen so far
+              as a max-heap in its first `size` slots. Updated in place.
+        size: The number of measurements currently in the heap.
+        minimum: The overall minimum measurement encountered so far.
+        epsilon: The acceptable relative error threshold.
+        measurements: The batch of measurements. Each must be greater than 0.
+
+    Returns:
+        A tuple `(converged, size, minimum)` holding whether the convergence criterion
+        was met, the new heap size, and the overall minimum measurement encountered.
+    """
+
+    k = heap.shape[0]
+    threshold = minimum * (1.0 + epsilon)
+
+    for measurement in measurements:
+        if measurement < minimum:
+            minimum = measurement
+            threshold = minimum * (1.0 + epsilon)
+
+        if size < k:
+            maximum = _heap_push_max(heap, size, measurement)
+            size += 1
+            if size < k:
+                continue
+        else:
+            maximum = _heap_pushpop_max(heap, size, measurement)
+
+        if maximum <= threshold:
+            return True, size, minimum
+
+    return False, size, minimum
@@ -0,0 +1,119 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+This module provides a compiled implementation of the k-best core, built with Cython.
+
+`KBestState` keeps the k smallest measurements in a C array of doubles used as a
+max-heap, alongside the overall minimum and the convergence threshold, so that
+processing a measurement involves no Python objects. It follows the protocol of
+the generator cores in `k_best`: it is primed with `next()`, each measurement is
+passed in with `send()`, which returns the overall minimum so far, and convergence
+is signalled by raising `StopIteration` carrying that minimum as its value.
+
+Build it in place with `python setup.py build_ext --inplace`.
+"""
+
+from cpython.mem cimport PyMem_Free, PyMem_Malloc
+from libc.math cimport INFINITY
+
+
+cdef class KBestState:
+    """
+    State of the k-best selection, with the k smallest measurements in a C max-heap.
+    """
+
+    cdef double* heap
+    cdef Py_ssize_t size
+    cdef Py_ssize_t cap
+    cdef double minimum
+    cdef double threshold
+    cdef double epsilon
+
+    def __cinit__(self, Py_ssize_t k, double epsilon):
+        self.heap = <double*> PyMem_Malloc(k * sizeof(double))
+        if self.heap == NULL:
+            raise MemoryError()
+        self.size = 0
+        self.cap = k
+        self.minimum = INFINITY
+        self.threshold = INFINITY
+        self.epsilon = epsilon
+
+    def __dealloc__(self):
+        PyMem_Free(self.heap)
+
+    def __next__(self):
+        """
+        Returns the overall minimum measurement encountered so far, priming the state
+        like a generator core.
+        """
+
+        return self.minimum
+
+    def send(self, double measurement):
+        """
+        Processes a measurement.
+
+        Args:
+            measurement: The new measurement. Must be greater than 0.
+
+        Returns:
+            The overall minimum measurement encountered so far.
+
+        Raises:
+            ValueError: If `measurement` is not greater than 0.
+            StopIteration: If the convergence criterion is met, carrying the minimum.
+        """
+
+        if measurement <= 0:
+            raise ValueError(f"measurement must be greater than 0, got {measurement}")
+
+        if self.size < self.cap:
+            self._update_minimum(measurement)
+            self._push(measurement)
+            # The error check cannot fire before k measurements have been collected.
+            if self.size < self.cap:
+                return self.minimum
+        elif measurement < self.heap[0]:
+            self._update_minimum(measurement)
+            self._replace_top(measurement)
+        else:
+            # A measurement no smaller than the k-th smallest leaves the state unchanged.
+            return self.minimum
+
+        if self.heap[0] <= self.threshold:
+            raise StopIteration(self.minimum)
+        return self.minimum
+
+    cdef inline void _update_minimum(self, double measurement):
+        if measurement < self.minimum:
+            self.minimum = measurement
+            self.threshold = measurement * (1.0 + self.epsilon)
+
+    cdef inline void _push(self, double value):
+        # Sift the new value up from the first free slot.
+        cdef Py_ssize_t i = self.size
+        cdef Py_ssize_t parent
+        while i > 0:
+            parent = (i - 1) >> 1
+            if self.heap[parent] >= value:
+                break
+            self.heap[i] = self.heap[parent]
+            i = parent
+        self.heap[i] = value
+        self.size += 1
+
+    cdef inline void _replace_top(self, double value):
+        # Replace the largest value and sift the new value down.
+        cdef Py_ssize_t i = 0
+        cdef Py_ssize_t child
+        while True:
+            child = 2 * i + 1
+            if child >= self.size:
+                break
+            if child + 1 < self.size and self.heap[child + 1] > self.heap[child]:
+                child += 1
+            if self.heap[child] <= value:
+                break
+            self.heap[i] = self.heap[child]
+            i = child
+        self.heap[i] = value
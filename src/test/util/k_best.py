@@ -9,30 +9,365 @@ a set of the `k` smallest measurements seen so far, while also tracking the
 absolute minimum measurement. It converges when the relative error between
 the `k`-th smallest measurement and the overall minimum falls below a specified
 epsilon threshold.
+
+`k_best_sync` is a synchronous counterpart of `k_best` for blocking sources, and
+`k_best_batch` implements the same criterion for sources that can deliver
+measurements in batches, performing the selection in compiled code when Numba
+is installed and with NumPy otherwise. It requires NumPy (the `numpy` extra),
+which is only imported when it is first called.
+
+The scalar selection runs in the compiled `_k_best_state` extension when it has
+been built with Cython (see `setup.py`), and in pure Python otherwise.
 """
 
-__all__: list[str] = ["k_best"]
+__all__: list[str] = ["k_best", "k_best_sync", "k_best_batch"]
 
+import asyncio
+import bisect
+import contextlib
+import functools
 import heapq
-from typing import Awaitable, Callable
+from types import ModuleType
+from typing import TYPE_CHECKING, AsyncGenerator, Awaitable, Callable, Generator, Protocol
 
+if TYPE_CHECKING:
+    import numpy as np
 
-def __relative_error(
-    measurement: float,
-    reference: float,
-) -> float:
+try:
+    import _k_best_state
+except ImportError:
+    _k_best_state = None
+
+
+@functools.cache
+def __native_kernels() -> ModuleType | None:
+    """
+    Imports the Numba-compiled kernels of `k_best_batch` on first use.
+
+    Importing Numba takes a noticeable fraction of a second, which the scalar
+    functions, and the command-line interface using them, should not pay for.
+
+    Returns:
+        The `_k_best_native` module, or None if Numba is not installed.
+    """
+
+    try:
+        import _k_best_native  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return None
+
+    return _k_best_native
+
+
+def __check_arguments(
+    k: int,
+    n: int,
+    epsilon: float,
+) -> None:
     """
-    Calculates the absolute relative error between a measurement and a reference value.
+    Validates the parameters shared by the k-best functions.
 
     Args:
-        measurement: The measured value.
-        reference: The reference value.
+        k: The number of "best" measurements to consider for the error check.
+        n: The maximum number of measurements to take.
+        epsilon: The acceptable relative error threshold.
+
+    Raises:
+        ValueError: If `k`, `n`, or `epsilon` are not valid (e.g., non-positive, or n < k).
+    """
+
+    if k <= 0:
+        raise ValueError(f"k must be greater than 0, got {k}")
+    if n <= 0 or n < k:
+        raise ValueError(
+            f"n must be greater than 0 and greater than or equal to k, got {n}"
+        )
+    if epsilon <= 0:
+        raise ValueError(f"epsilon must be greater than 0, got {epsilon}")
+
+
+class _KBestCore(Protocol):
+    """
+    Protocol of the k-best cores, met by the generator cores and by `KBestState`.
+
+    A core is primed with `next()`. Each measurement is then passed in with `send()`,
+    which returns the overall minimum measurement encountered so far. Once the
+    convergence criterion is met, `send()` raises `StopIteration` carrying that minimum
+    as its value. A measurement that is not greater than 0 raises `ValueError`.
+    """
+
+    def __next__(self) -> float: ...
+
+    def send(self, measurement: float, /) -> float:
+        """
+        Processes a measurement and returns the overall minimum encountered so far.
+        """
+
+
+def __k_best_core(
+    k: int,
+    epsilon: float,
+) -> _KBestCore:
+    """
+    Creates the core running the k-best selection for the given parameters.
+
+    For k = 1, the criterion is met by the first valid measurement, and the Python
+    core specialized for it is always used. For any other k, the `KBestState` of the
+    Cython extension `_k_best_state` is used when it has been built, taking precedence
+    over the Python specializations for k = 2 and small k; the Python core
+    specialized for k is used otherwise.
+
+    Args:
+        k: The number of "best" measurements to consider for the error check.
+        epsilon: The acceptable relative error threshold.
 
     Returns:
-        The absolute relative error.
+        A core following the `_KBestCore` protocol.
+    """
+
+    if k == 1:
+        return __k_best_core_single()
+
+    if _k_best_state is not None:
+        return _k_best_state.KBestState(k, epsilon)
+
+    # Small k are common and do not need the heap machinery; use specialized cores.
+    if k == 2:
+        return __k_best_core_pair(epsilon=epsilon)
+    if k <= 16:
+        return __k_best_core_sorted(k=k, epsilon=epsilon)
+    return __k_best_core_heap(k=k, epsilon=epsilon)
+
+
+def __k_best_core_single() -> Generator[float, float, float]:
+    """
+    k-best core specialized for k = 1.
+
+    The only "best" measurement is the minimum itself, so the relative error is 0
+    and the criterion is met by the first valid measurement.
+    """
+
+    measurement: float = yield float("inf")
+
+    if measurement <= 0:
+        raise ValueError(f"measurement must be greater than 0, got {measurement}")
+
+    return measurement
+
+
+def __k_best_core_pair(
+    epsilon: float,
+) -> Generator[float, float, float]:
+    """
+    k-best core specialized for k = 2, keeping the two smallest measurements in locals.
+    """
+
+    # The smallest and second smallest measurements, i.e. the minimum and the 'maximum'.
+    first: float = yield float("inf")
+    if first <= 0:
+        raise ValueError(f"measurement must be greater than 0, got {first}")
+
+    second: float = yield first
+    if second <= 0:
+        raise ValueError(f"measurement must be greater than 0, got {second}")
+
+    if second < first:
+        first, second = second, first
+    threshold: float = first * (1.0 + epsilon)
+
+    if second <= threshold:
+        return first
+
+    while True:
+        measurement: float = yield first
+
+        if measurement <= 0:
+            raise ValueError(f"measurement must be greater than 0, got {measurement}")
+
+        # A measurement no smaller than the second smallest changes neither value,
+        # and thus cannot make the criterion hold when it did not before.
+        if measurement < second:
+            if measurement < first:
+                first, second = measurement, first
+                threshold = first * (1.0 + epsilon)
+            else:
+                second = measurement
+
+            if second <= threshold:
+                return first
+
+
+def __k_best_core_sorted(
+    k: int,
+    epsilon: float,
+) -> Generator[float, float, float]:
+    """
+    k-best core for small k, keeping the k smallest measurements in a sorted list.
+
+    For small k, the list fits in a few cache lines; inserting into it is as cheap as
+    a heap update, and the k-th smallest measurement is simply its last element.
+    """
+
+    minimum: float = float("inf")
+    threshold: float = float("inf")
+    # The k smallest measurements encountered so far, in ascending order.
+    best: list[float] = []
+
+    for _ in range(k):
+        measurement: float = yield minimum
+
+        if measurement <= 0:
+            raise ValueError(f"measurement must be greater than 0, got {measurement}")
+
+        if measurement < minimum:
+            minimum = measurement
+            threshold = minimum * (1.0 + epsilon)
+
+        best.append(measurement)
+
+    best.sort()
+
+    if best[-1] <= threshold:
+        return minimum
+
+    # Bind the list primitives to local names; the lookups are hoisted out of the loop.
+    insort = bisect.insort
+    pop = best.pop
+
+    while True:
+        measurement = yield minimum
+
+        if measurement <= 0:
+            raise ValueError(f"measurement must be greater than 0, got {measurement}")
+
+        # A measurement no smaller than the k-th smallest does not enter the list,
+        # and thus cannot make the criterion hold when it did not before.
+        if measurement < best[-1]:
+            if measurement < minimum:
+                minimum = measurement
+                threshold = minimum * (1.0 + epsilon)
+
+            # Drop the current k-th smallest and insert the measurement in order.
+            pop()
+            insort(best, measurement)
+
+            if best[-1] <= threshold:
+                return minimum
+
+
+def __k_best_core_heap(
+    k: int,
+    epsilon: float,
+) -> Generator[float, float, float]:
+    """
+    General k-best core, keeping the k smallest measurements in a heap.
+    """
+
+    minimum: float = float("inf")
+    # The largest value the k-th best measurement may take for the relative error
+    # to be within epsilon. It only depends on the minimum, so it is recomputed
+    # only when the minimum changes.
+    threshold: float = float("inf")
+    # Use a min-heap to store negated measurements. This effectively simulates a max-heap
+    # for the actual measurements, allowing us to easily retrieve the largest of them.
+    # The heap will always contain at most 'k' elements, representing the k smallest
+    # measurements encountered so far.
+    heap: list[float] = []
+    # Bind the bounded-heap primitive to a local name; the lookup is hoisted out of the loop.
+    heap_replace = heapq.heapreplace
+
+    # Warm-up: the error check cannot fire before k measurements have been collected,
+    # so just gather them and build the heap once, in O(k) rather than O(k log k).
+    for _ in range(k):
+        # Hand back the current minimum and wait for the next measurement
+        measurement: float = yield minimum
+
+        if measurement <= 0:
+            raise ValueError(f"measurement must be greater than 0, got {measurement}")
+
+        # Update the overall minimum measurement encountered, and the threshold with it
+        if measurement < minimum:
+            minimum = measurement
+            threshold = minimum * (1.0 + epsilon)
+
+        heap.append(-measurement)
+
+    heapq.heapify(heap)
+
+    # The top of the min-heap (smallest element) is the negative of the
+    # k-th smallest measurement; negated, it is the 'maximum' of our current k-best set.
+    # Since maximum >= minimum > 0, the relative error (maximum - minimum) / minimum
+    # is within epsilon exactly when maximum <= minimum * (1 + epsilon).
+    if -heap[0] <= threshold:
+        # If the condition is met, return the overall minimum measurement.
+        return minimum
+
+    while True:
+        measurement = yield minimum
+
+        if measurement <= 0:
+            raise ValueError(f"measurement must be greater than 0, got {measurement}")
+
+        # A measurement no smaller than the k-th smallest would be pushed and popped
+        # right away, leaving the heap and the minimum unchanged. The criterion was not
+        # met with that state, so the check is only repeated when the heap changes.
+        if measurement < -heap[0]:
+            if measurement < minimum:
+                minimum = measurement
+                threshold = minimum * (1.0 + epsilon)
+
+            # Replace the smallest element with the negated measurement in a single sift.
+            # For our negated values, this removes the element that corresponds to the
+            # largest actual measurement, thus keeping only the k smallest.
+            heap_replace(heap, -measurement)
+
+            if -heap[0] <= threshold:
+                return minimum
+
+
+async def __measure_concurrently(
+    n: int,
+    input_function: Callable[[], Awaitable[float]],
+    concurrency: int,
+) -> AsyncGenerator[float, None]:
+    """
+    Takes up to `n` measurements with several calls to `input_function` in flight.
+
+    At most `concurrency` calls are awaited at any time, and no more than `n` are
+    started in total. Measurements are yielded in the order in which they complete.
+    Calls still in flight are cancelled when the generator is closed.
+
+    Args:
+        n: The maximum number of measurements to take.
+        input_function: An asynchronous callable that returns a new float measurement.
+        concurrency: The maximum number of calls to `input_function` in flight.
+
+    Yields:
+        The measurements, in order of completion.
     """
 
-    return abs(measurement - reference) / reference
+    started: int = 0
+    pending: set[asyncio.Future[float]] = set()
+    done: set[asyncio.Future[float]] = set()
+
+    try:
+        while started < n or pending:
+            # Top up the calls in flight, without exceeding n calls in total
+            while started < n and len(pending) < concurrency:
+                pending.add(asyncio.ensure_future(input_function()))
+                started += 1
+
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                yield future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+        # Also collect completed calls that were not yielded, so that their
+        # exceptions, if any, are retrieved rather than reported as unhandled.
+        await asyncio.gather(*pending, *done, return_exceptions=True)
 
 
 async def k_best(
@@ -40,26 +375,96 @@ async def k_best(
     n: int,
     epsilon: float,
     input_function: Callable[[], Awaitable[float]],
+    concurrency: int = 1,
 ) -> float:
     """
     Finds the minimum measurement such that the relative error between the
-    k-th largest measurement (among those currently considered 'best') and
+    k-th smallest measurement (the largest of those currently considered 'best') and
     the overall minimum measurement encountered so far is within `epsilon`.
 
-    This function continuously samples `n` measurements from `input_function`.
-    It maintains the `k` largest measurements seen so far using a max-heap
-    (simulated with a min-heap by negating values). Simultaneously, it tracks
-    the absolute minimum measurement observed. The process terminates and
-    returns the overall minimum measurement when the relative error condition is met.
+    This function samples up to `n` measurements from `input_function`. After each
+    one, it considers the `k` smallest measurements seen so far and compares the
+    largest of them with the overall minimum. The process terminates and returns
+    the overall minimum measurement as soon as the relative error condition is met.
 
     Args:
-        k: The number of "best" (largest) measurements to consider for the error check.
+        k: The number of "best" (smallest) measurements to consider for the error check.
            Must be greater than 0.
         n: The maximum number of measurements to take. Must be greater than 0
            and greater than or equal to k.
         epsilon: The acceptable relative error threshold. Must be greater than 0.
         input_function: An asynchronous callable that returns a new float measurement.
                         Each measurement must be greater than 0.
+        concurrency: The maximum number of calls to `input_function` awaited at once.
+                     Must be greater than 0. With more than one call in flight,
+                     measurements are processed in the order in which they complete,
+                     and calls still in flight are cancelled on convergence.
+
+    Returns:
+        The overall minimum measurement encountered when the convergence criterion is met.
+
+    Raises:
+        ValueError:
+            - If `k`, `n`, `epsilon` or `concurrency` are not valid (e.g., non-positive, or n < k).
+            - If any `measurement` returned by `input_function` is not greater than 0.
+            - If `n` measurements are processed and the k-best measurements (satisfying
+              the epsilon condition) are not found.
+    """
+
+    __check_arguments(k=k, n=n, epsilon=epsilon)
+    if concurrency <= 0:
+        raise ValueError(f"concurrency must be greater than 0, got {concurrency}")
+
+    core: _KBestCore = __k_best_core(k=k, epsilon=epsilon)
+    minimum: float = next(core)
+    # Bind the bound method once rather than looking it up for every measurement.
+    send = core.send
+
+    try:
+        if concurrency == 1:
+            for _ in range(n):
+                # Fetch a new measurement value and feed it to the selection
+                minimum = send(await input_function())
+        else:
+            async with contextlib.aclosing(
+                __measure_concurrently(
+                    n=n,
+                    input_function=input_function,
+                    concurrency=concurrency,
+                )
+            ) as measurements:
+                async for measurement in measurements:
+                    minimum = send(measurement)
+    except StopIteration as converged:
+        # The core has met the convergence criterion; its return value is the minimum.
+        return converged.value
+
+    # If n measurements are processed and the k-best condition is not met, raise an error.
+    raise ValueError(
+        f"k-best measurements not found within {n} attempts. Minimum measurement found is {minimum}"
+    )
+
+
+def k_best_sync(
+    k: int,
+    n: int,
+    epsilon: float,
+    input_function: Callable[[], float],
+) -> float:
+    """
+    Synchronous counterpart of `k_best` for in-memory or otherwise blocking sources.
+
+    The selection is identical to `k_best`, but `input_function` is called directly,
+    avoiding the creation and scheduling of a coroutine for every measurement.
+
+    Args:
+        k: The number of "best" measurements to consider for the error check.
+           Must be greater than 0.
+        n: The maximum number of measurements to take. Must be greater than 0
+           and greater than or equal to k.
+        epsilon: The acceptable relative error threshold. Must be greater than 0.
+        input_function: A callable that returns a new float measurement.
+                        Each measurement must be greater than 0.
 
     Returns:
         The overall minimum measurement encountered when the convergence criterion is met.
@@ -72,62 +477,131 @@ async def k_best(
               the epsilon condition) are not found.
     """
 
-    if k <= 0:
-        raise ValueError(f"k must be greater than 0, got {k}")
-    if n <= 0 or n < k:
-        raise ValueError(
-            f"n must be greater than 0 and greater than or equal to k, got {n}"
-        )
-    if epsilon <= 0:
-        raise ValueError(f"epsilon must be greater than 0, got {epsilon}")
+    __check_arguments(k=k, n=n, epsilon=epsilon)
+
+    core: _KBestCore = __k_best_core(k=k, epsilon=epsilon)
+    minimum: float = next(core)
+    # Bind the bound method once rather than looking it up for every measurement.
+    send = core.send
+
+    try:
+        for _ in range(n):
+            minimum = send(input_function())
+    except StopIteration as converged:
+        return converged.value
+
+    raise ValueError(
+        f"k-best measurements not found within {n} attempts. Minimum measurement found is {minimum}"
+    )
+
+
+async def k_best_batch(
+    k: int,
+    n: int,
+    epsilon: float,
+    input_function_batch: Callable[[int], Awaitable["np.ndarray"]],
+    batch_size: int = 64,
+) -> float:
+    """
+    Batched variant of `k_best` for sources that can produce many measurements at once.
+
+    Measurements are requested from `input_function_batch` in batches of at most
+    `batch_size`, and the selection runs in native code instead of once per
+    measurement in Python.
+
+    When Numba is installed, each batch is fed through a compiled max-heap that checks
+    the convergence criterion after every measurement, so a converging run returns the
+    same minimum as `k_best` on the same measurements. Otherwise, the k smallest measurements
+    are kept in a NumPy array refreshed with `np.partition` after every batch, and
+    convergence is checked once per batch; the returned minimum may then include
+    measurements taken after the point at which `k_best` would have stopped. In both
+    cases, every measurement of a batch is validated before the batch is processed.
+
+    This function requires NumPy, which is imported on first use so that the scalar
+    functions do not depend on it.
+
+    Args:
+        k: The number of "best" measurements to consider for the error check.
+           Must be greater than 0.
+        n: The maximum number of measurements to take. Must be greater than 0
+           and greater than or equal to k.
+        epsilon: The acceptable relative error threshold. Must be greater than 0.
+        input_function_batch: An asynchronous callable that, given a batch size, returns
+                              a non-empty array of at most that many float measurements.
+                              Each measurement must be greater than 0.
+        batch_size: The maximum number of measurements to request at once.
+                    Must be greater than 0.
+
+    Returns:
+        The overall minimum measurement encountered when the convergence criterion is met.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        ValueError:
+            - If `k`, `n`, `epsilon` or `batch_size` are not valid.
+            - If `input_function_batch` returns an empty batch.
+            - If any measurement returned by `input_function_batch` is not greater than 0.
+            - If `n` measurements are processed and the k-best measurements (satisfying
+              the epsilon condition) are not found.
+    """
+
+    # pylint: disable-next=import-outside-toplevel,redefined-outer-name
+    import numpy as np
+
+    __check_arguments(k=k, n=n, epsilon=epsilon)
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be greater than 0, got {batch_size}")
 
     measurement_count: int = 0
     minimum: float = float("inf")
-    # Use a min-heap to store negated measurements. This effectively simulates a max-heap
-    # for the actual measurements, allowing us to easily retrieve the k largest values.
-    # The heap will always contain at most 'k' elements, representing the k largest
-    # measurements encountered that are still relevant.
-    heap: list[float] = []
+    # With Numba, the k smallest measurements encountered so far are kept as a max-heap
+    # in the first `size` slots of a fixed buffer. Without it, they are kept in no
+    # particular order in an array of at most k elements.
+    native: ModuleType | None = __native_kernels()
+    heap: np.ndarray = np.empty(k, dtype=np.float64)
+    size: int = 0
+    best: np.ndarray = np.empty(0, dtype=np.float64)
 
     while measurement_count < n:
-        # Fetch a new measurement value
-        measurement: float = await input_function()
-        measurement_count += 1
+        # Fetch a new batch of measurements, never asking for more than n in total
+        measurements: np.ndarray = np.asarray(
+            await input_function_batch(min(batch_size, n - measurement_count)),
+            dtype=np.float64,
+        )
+        if measurements.size == 0:
+            raise ValueError("input_function_batch must return at least one measurement")
+        measurement_count += measurements.size
 
-        if measurement <= 0:
-            raise ValueError(f"measurement must be greater than 0, got {measurement}")
+        # Validate the whole batch with a single vectorized comparison. Testing for
+        # `> 0` rather than `<= 0` also rejects NaN, which compares false either way.
+        positive: np.ndarray = measurements > 0
+        if not positive.all():
+            raise ValueError(
+                f"measurement must be greater than 0, got {float(measurements[~positive][0])}"
+            )
+
+        if native is not None:
+            converged, size, minimum = native.consume(
+                heap, size, minimum, epsilon, measurements
+            )
+            if converged:
+                return minimum
+            continue
 
         # Update the overall minimum measurement encountered
-        minimum = min(minimum, measurement)
-
-        # Push the negated measurement onto the min-heap.
-        # This way, the smallest element in the heap corresponds to the
-        # largest actual measurement (because it's the smallest negative).
-        heapq.heappush(heap, -measurement)
-
-        # If the heap size exceeds k, remove the smallest element.
-        # For our negated values, this means removing the element that corresponds
-        # to the largest actual measurement, thus keeping only the k smallest.
-        if len(heap) > k:
-            heapq.heappop(heap)
-
-        # Once we have collected k measurements in the heap, we can perform the check.
-        if len(heap) == k:
-            # The top of the min-heap (smallest element) is the negative of the
-            # k-th largest measurement. Negate it to get the actual largest value.
-            # This is the 'maximum' of our current k-best set.
-            maximum: float = -heap[0]
-
-            # Check if the relative error between the current largest measurement
-            # and the overall minimum measurement is within the acceptable epsilon.
-            if (
-                __relative_error(
-                    measurement=maximum,
-                    reference=minimum,
-                )
-                <= epsilon
-            ):
-                # If the condition is met, return the overall minimum measurement.
+        minimum = min(minimum, float(np.minimum.reduce(measurements)))
+
+        # Keep only the k smallest of the previous best and the new batch.
+        # np.partition places the k smallest values in the first k slots in O(n).
+        best = np.concatenate((best, measurements))
+        if best.size > k:
+            best = np.partition(best, k - 1)[:k]
+
+        # The check can only be performed once k measurements have been collected.
+        if best.size == k:
+            # As in `k_best`, maximum >= minimum > 0, so the relative error is within
+            # epsilon exactly when maximum <= minimum * (1 + epsilon).
+            if float(best.max()) <= minimum * (1.0 + epsilon):
                 return minimum
 
     # If n measurements are processed and the k-best condition is not met, raise an error.
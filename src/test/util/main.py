@@ -2,36 +2,143 @@
 This module provides an asynchronous command-line interface for performing k-best measurements.
 
 It leverages `argparse` to configure the measurement parameters (k, n, epsilon)
-and `aioconsole` for asynchronous user input of float values.
+and an `asyncio.StreamReader` attached to standard input (or, where the event
+loop cannot watch it, a worker thread) for asynchronous user input of float values.
 The core k-best logic is delegated to the `k_best` library.
+When `uvloop` is installed, it is used in place of the default asyncio event loop.
 """
 
 import asyncio
 import argparse
-
-import aioconsole
+import contextlib
+import functools
+import os
+import re
+import selectors
+import stat
+import sys
+from typing import AsyncIterator, Awaitable, Callable
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 import k_best
 
+# A plain decimal or scientific-notation number, optionally surrounded by whitespace.
+# Lines are screened with it before conversion, so that invalid input is rejected
+# without constructing a `ValueError`.
+_FLOAT_RE: re.Pattern[bytes] = re.compile(
+    rb"^\s*[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\s*$"
+)
+
+
+def _is_pipe_transport_compatible(fd: int) -> bool:
+    """
+    Checks whether a file descriptor can be watched by the event loop.
+
+    Only FIFOs, sockets and character devices are candidates, and even among those
+    some (e.g. `/dev/null` under epoll) are rejected by the selector, so registration
+    is probed with a throwaway selector. Windows consoles are never compatible.
+
+    Args:
+        fd: The file descriptor to check.
+
+    Returns:
+        bool: Whether `loop.connect_read_pipe` can be used with `fd`.
+    """
+
+    if sys.platform == "win32":
+        return False
+
+    mode: int = os.fstat(fd).st_mode
+    if not (stat.S_ISFIFO(mode) or stat.S_ISSOCK(mode) or stat.S_ISCHR(mode)):
+        return False
+
+    with selectors.DefaultSelector() as selector:
+        try:
+            selector.register(fd, selectors.EVENT_READ)
+        except (ValueError, OSError):
+            return False
+
+    return True
+
+
+@contextlib.asynccontextmanager
+async def _open_console() -> AsyncIterator[Callable[[], Awaitable[bytes]]]:
+    """
+    Provides an asynchronous line reader for standard input.
+
+    When the event loop can watch standard input, an `asyncio.StreamReader` is
+    attached to a duplicate of its descriptor once, so reading a line does not
+    require a round trip through a worker thread. Otherwise (e.g. regular files,
+    `/dev/null` or Windows consoles), lines are read in the default executor.
+
+    The pipe transport switches the descriptor to non-blocking mode; since the
+    duplicate shares that flag with standard input, blocking mode is restored on
+    exit so that later readers of standard input are not affected.
 
-async def _get_float_from_console() -> float:
+    Yields:
+        Callable[[], Awaitable[bytes]]: A function reading the next line, which is
+        empty at the end of the input.
+    """
+
+    loop = asyncio.get_running_loop()
+
+    try:
+        fd: int = sys.stdin.fileno()
+    except (AttributeError, ValueError, OSError):
+        fd = -1
+
+    if fd < 0 or not _is_pipe_transport_compatible(fd):
+        yield functools.partial(loop.run_in_executor, None, sys.stdin.buffer.readline)
+        return
+
+    reader = asyncio.StreamReader()
+    protocol = asyncio.StreamReaderProtocol(reader)
+    # Attach a duplicate, so that closing the transport does not close standard input.
+    pipe = os.fdopen(os.dup(fd), "rb", buffering=0)
+
+    try:
+        transport, _ = await loop.connect_read_pipe(lambda: protocol, pipe)
+    except BaseException:
+        pipe.close()
+        os.set_blocking(fd, True)
+        raise
+
+    try:
+        yield reader.readline
+    finally:
+        transport.close()
+        os.set_blocking(fd, True)
+
+
+async def _get_float_from_console(readline: Callable[[], Awaitable[bytes]]) -> float:
     """
     Asynchronously prompts the user for a float input from the console.
 
-    This function uses `aioconsole.ainput()` to read input and
+    This function reads lines with `readline` and
     continuously prompts the user until a valid float number is entered.
 
+    Args:
+        readline: The line reader for standard input, as provided by `_open_console()`.
+
     Returns:
         float: The valid float number entered by the user.
+
+    Raises:
+        EOFError: If the end of the input is reached.
     """
 
     while True:
-        try:
-            user_input: str = await aioconsole.ainput()
+        user_input: bytes = await readline()
+        if not user_input:
+            raise EOFError("end of input reached before the measurement completed")
+        if _FLOAT_RE.match(user_input):
             value: float = float(user_input)
             return value
-        except ValueError:
-            print("Invalid input. Please enter a valid float number.")
+        print("Invalid input. Please enter a valid float number.")
 
 
 async def main():
@@ -69,31 +176,35 @@ async def main():
     args = parser.parse_args()
 
     # Basic validation for arguments
-    if not (isinstance(args.k, int) and args.k > 0):
+    if args.k <= 0:
         parser.error(f"Argument 'k' must be a positive integer, got: {args.k}")
-    if not (isinstance(args.n, int) and args.n > 0):
+    if args.n <= 0:
         parser.error(f"Argument 'n' must be a positive integer, got: {args.n}")
-    if not (isinstance(args.epsilon, (float, int)) and args.epsilon > 0):
+    if not args.epsilon > 0:
         parser.error(
             f"Argument 'epsilon' must be a positive float, got: {args.epsilon}"
         )
     if args.k > args.n:
         parser.error(f"Argument 'k' ({args.k}) cannot be greater than 'n' ({args.n}).")
 
-    print("Starting k-best measurement (using aioconsole)...")
+    print("Starting k-best measurement (reading from standard input)...")
     print(f"Configuration: k={args.k}, n={args.n}, epsilon={args.epsilon}")
 
-    try:
-        result = await k_best.k_best(
-            k=args.k,
-            n=args.n,
-            epsilon=args.epsilon,
-            input_function=_get_float_from_console,
-        )
-        print(f"The minimum value among the k-best measurements found is: {result}")
-    except ValueError as e:
-        print(f"Configuration error or invalid measurement values: {e}")
+    async with _open_console() as readline:
+        try:
+            result = await k_best.k_best(
+                k=args.k,
+                n=args.n,
+                epsilon=args.epsilon,
+                input_function=functools.partial(_get_float_from_console, readline),
+            )
+            print(f"The minimum value among the k-best measurements found is: {result}")
+        except ValueError as e:
+            print(f"Configuration error or invalid measurement values: {e}")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
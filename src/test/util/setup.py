@@ -0,0 +1,21 @@
+"""
+Builds the optional Cython implementation of the k-best core.
+
+Run `python setup.py build_ext --inplace` to compile `_k_best_state` next to
+`k_best.py`; `k_best` falls back to its pure-Python cores when it is not built.
+"""
+
+from Cython.Build import cythonize
+from setuptools import Extension, setup
+
+setup(
+    # The utilities are plain scripts; only the extension is built.
+    py_modules=[],
+    ext_modules=cythonize(
+        Extension(
+            name="_k_best_state",
+            sources=["_k_best_state.pyx"],
+            extra_compile_args=["-O3"],
+        ),
+    ),
+)
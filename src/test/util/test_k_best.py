@@ -0,0 +1,311 @@
+"""
+Tests for the `k_best` module.
+
+Every implementation of the selection (the Python cores, the Cython `KBestState`,
+and the batched NumPy and Numba paths) is compared against a straightforward
+reference on random streams, and the concurrent measurement of `k_best` is checked
+for bounded, cancellable calls to the input function.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+import k_best
+
+# k values covering every specialization of the core: k = 1, k = 2, the sorted list
+# (3 <= k <= 16) and the heap (k > 16).
+_KS: list[int] = [1, 2, 3, 5, 16, 17, 40]
+
+
+def _reference(
+    k: int,
+    n: int,
+    epsilon: float,
+    measurements: list[float],
+) -> float:
+    """
+    Runs the k-best selection by sorting every measurement seen so far at each step.
+    """
+
+    seen: list[float] = []
+    for measurement in measurements[:n]:
+        if measurement <= 0:
+            raise ValueError(f"measurement must be greater than 0, got {measurement}")
+        seen.append(measurement)
+        if len(seen) >= k:
+            best: list[float] = sorted(seen)[:k]
+            if best[-1] <= best[0] * (1.0 + epsilon):
+                return best[0]
+    raise ValueError(f"k-best measurements not found within {n} attempts")
+
+
+def _outcome(function, *args, **kwargs) -> tuple[str, float | str]:
+    """
+    Calls `function`, reducing its result or `ValueError` to a comparable value.
+    """
+
+    try:
+        result = function(*args, **kwargs)
+        if asyncio.iscoroutine(result):
+            result = asyncio.run(result)
+    except ValueError as error:
+        # Keep the message up to the offending value or the minimum found.
+        return "error", str(error).split(",", maxsplit=1)[0].split(".", maxsplit=1)[0]
+    return "result", result
+
+
+def _random_cases(
+    seed: int,
+    count: int,
+    invalid: bool = True,
+) -> list[tuple[int, int, float, list[float]]]:
+    """
+    Generates `(k, n, epsilon, measurements)` cases, some converging and some not.
+    """
+
+    rng = random.Random(seed)
+    cases: list[tuple[int, int, float, list[float]]] = []
+    for _ in range(count):
+        k: int = rng.choice(_KS)
+        n: int = rng.randint(k, 3 * k + 40)
+        epsilon: float = rng.choice([0.01, 0.05, 0.2, 1.0])
+        spread: float = rng.choice([0.02, 0.3, 2.0])
+        measurements: list[float] = [rng.uniform(1.0, 1.0 + spread) for _ in range(n)]
+        if invalid and rng.random() < 0.1:
+            measurements[rng.randrange(n)] = rng.choice([0.0, -1.0])
+        cases.append((k, n, epsilon, measurements))
+    return cases
+
+
+def _async_source(measurements: list[float]):
+    """
+    Wraps `measurements` into an asynchronous input function for `k_best`.
+    """
+
+    source = iter(measurements)
+
+    async def input_function() -> float:
+        return next(source)
+
+    return input_function
+
+
+def _batch_source(np, measurements: list[float]):
+    """
+    Wraps `measurements` into an asynchronous batched input function for `k_best_batch`.
+    """
+
+    position: int = 0
+
+    async def input_function_batch(size: int):
+        nonlocal position
+        batch = np.array(measurements[position : position + size])
+        position += size
+        return batch
+
+    return input_function_batch
+
+
+@pytest.fixture(params=["python", "cython"])
+def core(request, monkeypatch) -> str:
+    """
+    Selects the implementation of the scalar core used by `k_best` and `k_best_sync`.
+    """
+
+    if request.param == "python":
+        monkeypatch.setattr(k_best, "_k_best_state", None)
+    elif k_best._k_best_state is None:  # pylint: disable=protected-access
+        pytest.skip("the Cython extension _k_best_state is not built")
+    return request.param
+
+
+@pytest.mark.usefixtures("core")
+@pytest.mark.parametrize("seed", range(4))
+def test_k_best_sync_matches_reference(seed):
+    """
+    `k_best_sync` agrees with the reference for every core.
+    """
+
+    for k, n, epsilon, measurements in _random_cases(seed=seed, count=200):
+        expected = _outcome(_reference, k, n, epsilon, measurements)
+        actual = _outcome(k_best.k_best_sync, k, n, epsilon, iter(measurements).__next__)
+        assert actual == expected, (k, n, epsilon, measurements)
+
+
+@pytest.mark.usefixtures("core")
+@pytest.mark.parametrize("seed", range(2))
+def test_k_best_matches_reference(seed):
+    """
+    `k_best` agrees with the reference for every core.
+    """
+
+    for k, n, epsilon, measurements in _random_cases(seed=seed, count=100):
+        expected = _outcome(_reference, k, n, epsilon, measurements)
+        actual = _outcome(k_best.k_best, k, n, epsilon, _async_source(measurements))
+        assert actual == expected, (k, n, epsilon, measurements)
+
+
+@pytest.mark.parametrize(
+    ("native", "batch_size"),
+    [(False, 1), (True, 1), (True, 16)],
+    ids=["numpy-1", "numba-1", "numba-16"],
+)
+def test_k_best_batch_matches_reference(monkeypatch, native, batch_size):
+    """
+    `k_best_batch` agrees with the reference wherever its batching cannot matter.
+
+    With one measurement per batch, both paths check the criterion after every
+    measurement. With larger batches, only the Numba path still does (the NumPy path
+    checks once per batch), and it validates the whole batch first, so only valid
+    streams are compared.
+    """
+
+    np = pytest.importorskip("numpy")
+    if native:
+        pytest.importorskip("numba")
+    else:
+        monkeypatch.setattr(k_best, "__native_kernels", lambda: None)
+
+    for k, n, epsilon, measurements in _random_cases(seed=7, count=200, invalid=batch_size == 1):
+        expected = _outcome(_reference, k, n, epsilon, measurements)
+        actual = _outcome(
+            k_best.k_best_batch,
+            k,
+            n,
+            epsilon,
+            _batch_source(np, measurements),
+            batch_size=batch_size,
+        )
+        assert actual == expected, (k, n, epsilon, measurements)
+
+
+class _Source:  # pylint: disable=too-few-public-methods
+    """
+    An asynchronous input function recording how its calls start and end.
+
+    Call i sleeps for `delays[i]` seconds, then returns `values[i]`, or raises it if it
+    is an exception.
+    """
+
+    def __init__(self, values: list, delays: list[float]):
+        self.values = values
+        self.delays = delays
+        self.started: int = 0
+        self.cancelled: int = 0
+        self.in_flight: int = 0
+        self.peak: int = 0
+
+    async def __call__(self) -> float:
+        index: int = self.started
+        self.started += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays[index])
+            value = self.values[index]
+            if isinstance(value, Exception):
+                raise value
+            return value
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+
+def _run_concurrently(source: _Source, k: int, n: int, concurrency: int) -> float:
+    """
+    Runs `k_best` on `source`, failing instead of hanging if calls are not cancelled.
+    """
+
+    return asyncio.run(
+        asyncio.wait_for(
+            k_best.k_best(k, n, 0.05, source, concurrency=concurrency),
+            timeout=5,
+        )
+    )
+
+
+def test_concurrent_calls_are_cancelled_on_convergence():
+    """
+    Calls still in flight when the criterion is met are cancelled.
+    """
+
+    source = _Source(values=[1.0] * 10, delays=[0, 0, 0] + [60] * 7)
+
+    assert _run_concurrently(source, k=3, n=10, concurrency=4) == 1.0
+    assert source.started >= 4
+    assert source.cancelled == source.started - 3
+    assert source.in_flight == 0
+
+
+def test_concurrent_calls_are_cancelled_on_invalid_measurement():
+    """
+    Calls still in flight when a measurement is rejected are cancelled.
+    """
+
+    source = _Source(values=[1.0, -1.0] + [1.0] * 8, delays=[0, 0] + [60] * 8)
+
+    with pytest.raises(ValueError, match="measurement must be greater than 0"):
+        _run_concurrently(source, k=3, n=10, concurrency=4)
+    assert source.started >= 4
+    assert source.cancelled == source.started - 2
+    assert source.in_flight == 0
+
+
+def test_concurrent_calls_are_cancelled_on_input_error():
+    """
+    An exception from the input function propagates, and the other calls are cancelled.
+    """
+
+    source = _Source(values=[RuntimeError("unavailable")] + [1.0] * 9, delays=[0] + [60] * 9)
+
+    with pytest.raises(RuntimeError, match="unavailable"):
+        _run_concurrently(source, k=3, n=10, concurrency=4)
+    assert source.started >= 4
+    assert source.cancelled == source.started - 1
+    assert source.in_flight == 0
+
+
+@pytest.mark.parametrize("concurrency", [2, 4, 32])
+def test_concurrent_calls_are_bounded(concurrency):
+    """
+    No more than n calls are started, and no more than `concurrency` run at once.
+    """
+
+    rng = random.Random(concurrency)
+    n: int = 10
+    source = _Source(
+        # Distinct values far enough apart that the criterion is never met.
+        values=[float(value) for value in range(1, 2 * n + 1)],
+        delays=[rng.uniform(0, 0.005) for _ in range(2 * n)],
+    )
+
+    with pytest.raises(ValueError, match="k-best measurements not found"):
+        _run_concurrently(source, k=3, n=n, concurrency=concurrency)
+    assert source.started == n
+    assert source.peak <= concurrency
+    assert source.in_flight == 0
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        {"k": 0, "n": 10, "epsilon": 0.05},
+        {"k": 3, "n": 2, "epsilon": 0.05},
+        {"k": 3, "n": 10, "epsilon": 0.0},
+        {"k": 3, "n": 10, "epsilon": 0.05, "concurrency": 0},
+    ],
+)
+def test_k_best_rejects_invalid_arguments(arguments):
+    """
+    Invalid parameters are rejected before any measurement is taken.
+    """
+
+    source = _Source(values=[1.0] * 10, delays=[0] * 10)
+
+    with pytest.raises(ValueError):
+        asyncio.run(k_best.k_best(input_function=source, **arguments))
+    assert source.started == 0